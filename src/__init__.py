@@ -1,3 +1,3 @@
-from env_types import BaseEnvironment
-from runners import BaseRunner
-from web import Server
\ No newline at end of file
+from .env_types import BaseEnvironment
+from .runners import BaseRunner, split_by_not_in_blocks_or_strings
+from .web import Server
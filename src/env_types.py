@@ -1,5 +1,10 @@
 from __future__ import annotations
 
+from collections import deque
+from functools import lru_cache
+from itertools import repeat
+from operator import index
+
 from flask_socketio import emit
 
 
@@ -14,19 +19,42 @@ class BaseEnvironment:
         self._vars: dict[str, object] = {}
         self.last: object = ""
         self.chat: list[str] = []
+        self._out_buf: list[str] = []
+        self._out_chars = 0
 
     def output(self, x):
         """
-        Output a value to the server and append it to the chat history.
+        Queue a value for the server and append it to the chat history.
+
+        Queued outputs are sent together by `flush`, which runs automatically
+        once 64 values or 4096 characters are waiting. `Server` flushes after
+        each submitted program; code driving runners or calling `output`
+        from its own handlers must call `flush` itself when it is done.
+        """
+        s = x if type(x) is str else str(x)
+        self._out_buf.append(s)
+        self._out_chars += len(s)
+        if len(self._out_buf) >= 64 or self._out_chars >= 4096:
+            self.flush()
+
+        self.chat.append(s)
+        self.last = x
+
+    def flush(self):
+        """
+        Send all queued outputs to the server as a single message.
         """
+        if not self._out_buf:
+            return
+
+        payload = "\n".join(self._out_buf)
+        self._out_buf = []
+        self._out_chars = 0
         try:
-            emit("server", str(x))
+            emit("server", payload)
         except RuntimeError:
             pass
 
-        self.chat.append(str(x))
-        self.last = x
-
     def get(self, name):
         """
         Retrieve the value of a variable by name and update the last accessed variable.
@@ -39,45 +67,77 @@ class BaseEnvironment:
         self._vars[name] = value
 
 
+@lru_cache(maxsize=1024)
+def _hex_to_int(addr: str) -> int:
+    return int(addr, 16)
+
+
+def _address(addr) -> int:
+    """Resolve a heap address given as a `HexValue` or a hex string."""
+    if isinstance(addr, HexValue):
+        return addr.value
+    return _hex_to_int(addr)
+
+
 class CEnvironment(BaseEnvironment):
+    # Freed blocks are kept for reuse only up to this many cells, and only
+    # this many per size, so the pool stays bounded whatever sizes a script asks for.
+    POOL_MAX_BLOCK = 256
+    POOL_PER_SIZE = 4
+
     def __init__(self):
         super().__init__()
-        self.heap = [{"value": None, "free": True} for _ in range(255)]
-        self._first_free = 1
+        self._heap_values: list[object] = [None] * 255
+        self._heap_free = bytearray(b"\x01" * 255)
+        self._free_slots = deque(range(1, 255))
+        self._list_pool: dict[int, list[list]] = {}
 
     def alloc(self, amount: int):
-        # Find first free slot safely
-        while self._first_free < len(self.heap) and not self.heap[self._first_free]["free"]:
-            self._first_free += 1
-
-        if self._first_free >= len(self.heap):
+        if not self._free_slots:
             return None  # out of heap slots
 
-        self.heap[self._first_free]["free"] = False
-        self.heap[self._first_free]["value"] = [None for _ in range(amount)]
+        # Build the block before taking a slot so a bad amount can't leak one
+        size = index(amount)
+        pooled = self._list_pool.get(size)
+        block = pooled.pop() if pooled else [None] * size
 
-        addr = self._first_free
-        self._first_free = 1  # next allocation searches from start
-        return hex(addr)[2:]  # without 0x
+        addr = self._free_slots.popleft()
+        self._heap_free[addr] = 0
+        self._heap_values[addr] = block
+        return f"{addr:02x}"  # without 0x
 
     def free(self, addr):
-        addr_i = int(addr, 16)
-        self.heap[addr_i]["free"] = True
-        self.heap[addr_i]["value"] = None
-        self._first_free = addr_i
+        addr_i = _address(addr)
+        if self._heap_free[addr_i]:
+            return  # already free
+
+        self._heap_free[addr_i] = 1
+        value = self._heap_values[addr_i]
+        self._heap_values[addr_i] = None
+        # Keep the cleared block for the next alloc of the same size
+        size = len(value)
+        if size <= self.POOL_MAX_BLOCK:
+            pooled = self._list_pool.setdefault(size, [])
+            if len(pooled) < self.POOL_PER_SIZE:
+                value[:] = repeat(None, size)
+                pooled.append(value)
+        # Reuse the most recently freed slot first
+        self._free_slots.appendleft(addr_i)
 
     def heapget(self, addr, inneraddr):
-        value = self.heap[int(addr, 16)]["value"][int(inneraddr, 16)]
+        value = self._heap_values[_address(addr)][_address(inneraddr)]
         self.last = value
         return value
 
     def heapset(self, addr, inneraddr, value):
-        self.heap[int(addr, 16)]["value"][int(inneraddr, 16)] = value
+        self._heap_values[_address(addr)][_address(inneraddr)] = value
 
 
 class BaseEnvType:
     """Base class for environment types."""
 
+    __slots__ = ("value",)
+
     def __init__(self, value):
         self.value = value
 
@@ -90,12 +150,15 @@ class BaseEnvType:
 
 class Variable(BaseEnvType):
     """Represents a variable in the environment type system."""
-    pass
+
+    __slots__ = ()
 
 
 class BlockType(BaseEnvType):
     """Represents a block in the environment type system."""
 
+    __slots__ = ()
+
     @property
     def converted(self) -> str:
         return self.value[1:-1]
@@ -104,6 +167,8 @@ class BlockType(BaseEnvType):
 class HexValue(BaseEnvType):
     """A class representing hexadecimal values."""
 
+    __slots__ = ()
+
     @property
     def as_hex(self) -> str:
         return hex(self.value)
@@ -1,9 +1,43 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from json import loads, dumps
+import inspect
+import re
+import sys
 
 from .env_types import Variable, BlockType, BaseEnvironment, HexValue
 
+try:
+    from orjson import loads as _orjson_loads
+except ImportError:  # orjson is optional
+    _orjson_loads = None
+
+
+_FLOAT_RE = re.compile(
+    r"[+-]?(?:(?:\d+\.\d*|\.\d+|\d+)(?:[eE][+-]?\d+)?|inf(?:inity)?|nan)\Z",
+    re.IGNORECASE,
+)
+_HEX_RE = re.compile(r"[+-]?(?:0[xX])?[0-9a-fA-F]+\Z")
+
+
+@lru_cache(maxsize=None)
+def _token_re(sep: str):
+    """
+    Compile the tokenizer used by `split_by_not_in_blocks_or_strings` for `sep`.
+
+    Only escapes, quoted strings, parentheses and `sep` are matched; plain
+    text between them is skipped by the regex engine.
+    """
+    return re.compile(
+        r"\\.?"
+        r'|"(?:\\.|[^"\\])*"?'
+        r"|'(?:\\.|[^'\\])*'?"
+        r"|[()]"
+        r"|" + re.escape(sep),
+        re.DOTALL,
+    )
+
 
 def split_by_not_in_blocks_or_strings(text: str, sep: str = " "):
     """
@@ -13,51 +47,150 @@ def split_by_not_in_blocks_or_strings(text: str, sep: str = " "):
     Handles escaped quotes and separators.
     """
     result = []
-    buf = []
+    start = 0
     depth = 0
-    in_quote = None
-    escape = False
-
-    for c in text:
-        if escape:
-            buf.append(c)
-            escape = False
-            continue
-
-        if c == "\\":
-            buf.append(c)
-            escape = True
-            continue
-        if in_quote:
-            buf.append(c)
-            if c == in_quote:
-                in_quote = None
-            continue
-        elif c in ("'", '"'):
-            buf.append(c)
-            in_quote = c
-            continue
-        if c == "(":
+
+    for tok in _token_re(sep).finditer(text):
+        t = tok.group()
+        if t == sep:
+            if depth == 0:
+                result.append(text[start:tok.start()].strip())
+                start = tok.end()
+        elif t == "(":
             depth += 1
-            buf.append(c)
-            continue
-        if c == ")":
+        elif t == ")":
             depth = max(depth - 1, 0)
-            buf.append(c)
-            continue
-        if c == sep and depth == 0 and not in_quote:
-            result.append("".join(buf).strip())
-            buf = []
-        else:
-            buf.append(c)
 
-    if buf:
-        result.append("".join(buf).strip())
+    if start < len(text):
+        result.append(text[start:].strip())
     return result
 
 
+def _loads(s: str):
+    """
+    Parse a JSON token, preferring orjson when it is installed.
+
+    Documents orjson rejects (NaN, integers wider than 64 bits) are
+    retried with the standard library parser.
+    """
+    if _orjson_loads is not None:
+        try:
+            return _orjson_loads(s)
+        except ValueError:
+            pass
+    return loads(s)
+
+
+def _classify_any(s: str):
+    """Classify a token by trying every rule in order of precedence."""
+    if len(s) >= 2 and s.startswith('"') and s[-1] == '"':
+        return "str", s[1:-1]
+    elif s.isdigit():
+        return "int", int(s)
+    elif _FLOAT_RE.match(s):
+        return "float", float(s)
+    elif len(s) >= 2 and s[0] in {"{", "["} and s[-1] in {"}", "]"}:
+        return "json", None
+    elif s[:2] == "0x" and _HEX_RE.match(s[2:]):
+        return "hex", int(s[2:], 16)
+    elif _HEX_RE.match(s):
+        return "hex", int(s, 16)
+    elif len(s) >= 2 and s.startswith("(") and s[-1] == ")":
+        return "block", s
+    else:
+        return "var", s
+
+
+def _classify_string(s: str):
+    if len(s) >= 2 and s[-1] == '"':
+        return "str", s[1:-1]
+    return "var", s
+
+
+def _classify_number(s: str):
+    if s.isdigit():
+        return "int", int(s)
+    elif _FLOAT_RE.match(s):
+        return "float", float(s)
+    elif s[:2] == "0x" and _HEX_RE.match(s[2:]):
+        return "hex", int(s[2:], 16)
+    elif _HEX_RE.match(s):
+        return "hex", int(s, 16)
+    return "var", s
+
+
+def _classify_json(s: str):
+    if len(s) >= 2 and s[-1] in {"}", "]"}:
+        return "json", None
+    return "var", s
+
+
+def _classify_block(s: str):
+    if len(s) >= 2 and s[-1] == ")":
+        return "block", s
+    return "var", s
+
+
+def _classify_hex_word(s: str):
+    if _HEX_RE.match(s):
+        return "hex", int(s, 16)
+    return "var", s
+
+
+def _classify_float_word(s: str):
+    if _FLOAT_RE.match(s):
+        return "float", float(s)
+    return "var", s
+
+
+def _classify_name(s: str):
+    return "var", s
+
+
+# Tokens are dispatched on their first character; anything not listed here
+# (non-ASCII, punctuation, ...) goes through the full rule chain.
+_CLASSIFIERS = {
+    '"': _classify_string,
+    "{": _classify_json,
+    "[": _classify_json,
+    "(": _classify_block,
+}
+_CLASSIFIERS.update(dict.fromkeys("0123456789+-.", _classify_number))
+_CLASSIFIERS.update(dict.fromkeys("_ghjklmopqrstuvwxyzGHJKLMOPQRSTUVWXYZ", _classify_name))
+_CLASSIFIERS.update(dict.fromkeys("abcdefABCDEF", _classify_hex_word))
+_CLASSIFIERS.update(dict.fromkeys("iInN", _classify_float_word))
+
+
+@lru_cache(maxsize=4096)
+def _classify(s: str):
+    """
+    Classify a raw token as `(tag, payload)`.
+
+    Only immutable payloads are cached; `BaseRunner.to_type` builds the
+    wrapper objects and parses JSON on every call.
+    """
+    if not s:
+        return "var", s
+    tag, payload = _CLASSIFIERS.get(s[0], _classify_any)(s)
+    if tag == "var":
+        payload = sys.intern(payload)
+    return tag, payload
+
+
+@lru_cache(maxsize=None)
+def _to_type_needs_instance(cls) -> bool:
+    """Whether `cls` overrides `to_type` as a plain instance method."""
+    return inspect.isfunction(inspect.getattr_static(cls, "to_type"))
+
+
 class BaseRunner:
-    """Base Runner is used ONLY to create other Runner classes"""
+    """
+    Base Runner is used ONLY to create other Runner classes
+
+    `to_type` classifies tokens with module-level patterns and caches the
+    result for all runners, so overriding `floating` or `hexable` does not
+    change how arguments are parsed; override `to_type` instead.
+    """
 
     COMMANDS = {}
 
@@ -66,12 +199,15 @@ class BaseRunner:
         Initialize a Runner instance.
         """
         self._value = val
-        self._args = args if args is not None else []
+        self._args = tuple(args) if args is not None else ()
         self.env = env if env is not None else BaseEnvironment()
+        self._func = self.COMMANDS.get(val)
 
     @staticmethod
     def floating(val) -> bool:
         """Check if a value can be converted to a float."""
+        if isinstance(val, str):
+            return _FLOAT_RE.match(val) is not None
         try:
             float(val)
             return True
@@ -81,37 +217,38 @@ class BaseRunner:
     @staticmethod
     def hexable(val) -> bool:
         """Check if a value can be converted to a hexadecimal integer."""
+        if isinstance(val, str):
+            return _HEX_RE.match(val) is not None
         try:
             int(val, 16)
             return True
         except (TypeError, ValueError):
             return False
 
-    def to_type(self, s: str):
+    @staticmethod
+    def to_type(s: str):
         """
         Convert a string representation into its corresponding Python type or custom object.
+
+        Overrides should be `@staticmethod`s. Instance-method overrides still
+        work, but `from_string` then has to build a throwaway runner per line.
         """
         if not isinstance(s, str):
             return s
 
-        if len(s) >= 2 and s.startswith('"') and s[-1] == '"':
-            return s[1:-1]
-        elif s.isdigit():
-            return int(s)
-        elif self.floating(s):
-            return float(s)
-        elif len(s) >= 2 and s[0] in {"{", "["} and s[-1] in {"}", "]"}:
-            return loads(s)
-        elif s[:2] == "0x" and self.hexable(s[2:]):
-            return HexValue(int(s[2:], 16))
-        elif self.hexable(s):
-            return HexValue(int(s, 16))
-        elif len(s) >= 2 and s.startswith("(") and s[-1] == ")":
-            return BlockType(s)
-        else:
-            return Variable(s)
+        tag, payload = _classify(s)
+        if tag == "json":
+            return _loads(s)
+        elif tag == "hex":
+            return HexValue(payload)
+        elif tag == "block":
+            return BlockType(payload)
+        elif tag == "var":
+            return Variable(payload)
+        return payload
 
-    def from_type(self, s):
+    @staticmethod
+    def from_type(s):
         """
         Convert a value to a string representation based on its type.
         """
@@ -140,16 +277,21 @@ class BaseRunner:
         Create an instance from a string representation: "callable arg1 arg2 ..."
         """
         sp = split_by_not_in_blocks_or_strings(s)
-        temp = cls("", [], BaseEnvironment())
-        all_args = [temp.to_type(i) for i in sp[1:]]
-        return cls(sp[0], all_args, env)
+        if _to_type_needs_instance(cls):
+            to_type = cls("", [], BaseEnvironment()).to_type
+        else:
+            to_type = cls.to_type
+        all_args = [to_type(i) for i in sp[1:]]
+        return cls(sys.intern(sp[0]), all_args, env)
 
     def run(self, error: bool = False):
         """
         Execute a command from the COMMANDS registry based on the stored value and arguments.
         """
         try:
-            self.COMMANDS[self._value](*self._args, env=self.env)
+            # Commands registered after this runner was built are still looked up
+            func = self._func or self.COMMANDS[self._value]
+            func(*self._args, env=self.env)
         except Exception:
             if error:
                 raise
@@ -13,6 +13,31 @@ app = flask.Flask(__name__)
 app.secret_key = secrets.token_hex(32)
 socketio = SocketIO(app, manage_session=True)
 
+# hashlib.pbkdf2_hmac is OpenSSL's PKCS5_PBKDF2_HMAC, which picks the
+# SHA-NI/AVX SHA-256 kernels at runtime where the CPU has them.
+_PBKDF2_HASH = "sha256"
+_PBKDF2_ITERATIONS = 200_000
+
+
+def _pbkdf2(password: str, salt: bytes) -> bytes:
+    """
+    Derive a password key without stalling other socket events.
+
+    Under eventlet/gevent the hash runs on the hub's native thread pool and the
+    calling greenlet yields while it waits. In threading mode it runs inline:
+    pbkdf2_hmac releases the GIL, so other request threads keep running.
+    """
+    args = (_PBKDF2_HASH, password.encode("utf-8"), salt, _PBKDF2_ITERATIONS)
+    if socketio.async_mode == "eventlet":
+        from eventlet import tpool
+
+        return tpool.execute(hashlib.pbkdf2_hmac, *args)
+    if socketio.async_mode.startswith("gevent"):
+        from gevent import get_hub
+
+        return get_hub().threadpool.apply(hashlib.pbkdf2_hmac, args)
+    return hashlib.pbkdf2_hmac(*args)
+
 
 def verify_password(password: str, stored: str) -> bool:
     """
@@ -21,18 +46,13 @@ def verify_password(password: str, stored: str) -> bool:
     salt_hex, key_hex = stored.split(":")
     salt = bytes.fromhex(salt_hex)
     stored_key = bytes.fromhex(key_hex)
-    new_key = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, 200_000)
+    new_key = _pbkdf2(password, salt)
     return hmac.compare_digest(new_key, stored_key)
 
 
 def hash_password(password: str) -> str:
     salt = secrets.token_bytes(16)
-    key = hashlib.pbkdf2_hmac(
-        "sha256",
-        password.encode("utf-8"),
-        salt,
-        200_000,
-    )
+    key = _pbkdf2(password, salt)
     return salt.hex() + ":" + key.hex()
 
 
@@ -91,15 +111,20 @@ class Server:
             text = (data or {}).get("text")
             if not isinstance(text, str):
                 emit("server", "Error: input must be a string")
-                self.sandboxes[flask.session["user"]].output("Error: input must be a string")
+                envir = self.sandboxes[flask.session["user"]]
+                envir.output("Error: input must be a string")
+                envir.flush()
                 return False
 
             emit("clear", "")
 
             envir = self.sandboxes[flask.session["user"]]
-            for i in split_by_not_in_blocks_or_strings(text, "\n"):
-                if i.strip():
-                    self.runner_cls.from_string(i, envir).run()
+            try:
+                for i in split_by_not_in_blocks_or_strings(text, "\n"):
+                    if i.strip():
+                        self.runner_cls.from_string(i, envir).run()
+            finally:
+                envir.flush()
 
             return True
 